@@ -8,6 +8,9 @@ host = api.host.get(filter={"host": config["host_name"]}, output=["hostid", "nam
 host_id = host[0]['hostid']
 item_map = fetch_item_ids(api, host_id, config['item_keys'])
 
+# Pick up retrained models from ./model/ without restarting the service
+start_model_watcher(poll_interval=10.0)
+
 while True:
     # Extract features from Zeek logs
     rows = []
@@ -1,21 +1,232 @@
+import hashlib
+import os
+import threading
+import time
+
 import numpy as np
+from tensorflow.keras.layers import Dense, InputLayer
 from tensorflow.keras.models import load_model as keras_load_model
 
-# Internal variable to hold the model instance
-_model = None
+# Internal variable to hold the model manager instance
+_manager = None
 _model_path = "./model/discriminator_saved_model.keras"
+_scaler_path = "./model/discriminator_scaler.npz"
+_input_dim = 122
+_predict_batch_size = 32
+
+def fold_scaler_into_model(model, scale: np.ndarray, offset: np.ndarray):
+    """
+    Folds the MinMaxScaler affine transform (x * scale + offset) into the
+    first Dense layer, so the model can be fed raw (unscaled) features:
+        (x * s + m) @ W + b == x @ (s[:, None] * W) + (m @ W + b)
+    """
+    # The fold is only exact if the scaled input goes straight into this Dense layer
+    layers = [layer for layer in model.layers if not isinstance(layer, InputLayer)]
+    if not layers or not isinstance(layers[0], Dense):
+        first = type(layers[0]).__name__ if layers else None
+        raise ValueError(f"Cannot fold scaler: model's first layer must be Dense, got {first}")
+    dense = layers[0]
+    if not dense.use_bias:
+        raise ValueError("Cannot fold scaler: model's first Dense layer has no bias")
+    kernel, bias = dense.get_weights()
+
+    scale = np.asarray(scale, dtype=np.float64)
+    offset = np.asarray(offset, dtype=np.float64)
+    if scale.shape[0] != kernel.shape[0]:
+        raise ValueError(
+            f"Scaler has {scale.shape[0]} features but model expects {kernel.shape[0]}"
+        )
+
+    folded_kernel = scale[:, None] * kernel
+    folded_bias = bias + offset @ kernel
+    dense.set_weights([folded_kernel.astype(kernel.dtype), folded_bias.astype(bias.dtype)])
+    return model
+
+def file_sha256(path):
+    """
+    Hex SHA-256 of a file, used to bind a saved scaler to the model it was fit for.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_scoring_model(model_path=_model_path, scaler_path=_scaler_path, require_scaler=False):
+    """
+    Loads the discriminator and folds the training-time normalization saved
+    next to it into its weights. The scaler records the SHA-256 of the model
+    file it was saved with, and a scaler saved for a different model is
+    rejected. Models saved before the scaler was persisted have no scaler and
+    are loaded unscaled unless require_scaler is set.
+    """
+    if not os.path.exists(scaler_path):
+        if require_scaler:
+            raise FileNotFoundError(f"Scaler not found at {scaler_path}")
+        print(
+            f"Warning: no scaler at {scaler_path}, scoring UNSCALED features; "
+            "re-run GAN.ipynb to save the model together with its scaler"
+        )
+        model = keras_load_model(model_path)
+        model.trainable = False
+        return model
+
+    with np.load(scaler_path) as params:
+        if 'model_sha256' not in params:
+            raise ValueError(f"Scaler at {scaler_path} is not bound to a model (no model_sha256)")
+        if str(params['model_sha256']) != file_sha256(model_path):
+            raise ValueError(f"Scaler at {scaler_path} was not saved for the model at {model_path}")
+        scale, offset = params['scale'], params['min']
+
+    model = keras_load_model(model_path)
+    model.trainable = False
+    fold_scaler_into_model(model, scale, offset)
+    return model
+
+class ModelManager:
+    """
+    Holds the live scoring model and hot-reloads it when the model directory
+    changes. New versions are loaded, validated and warmed up on a background
+    thread, then swapped in with a single reference assignment, so a batch
+    always runs against one complete model and scoring never waits on a load.
+
+    A reload candidate is only accepted if its scaler was saved for that exact
+    model file (see load_scoring_model) and neither file changed while it was
+    being loaded. Half-finished deploys, in either copy order, are rejected
+    and retried when the files change again.
+    """
+    def __init__(self, model_path=_model_path, scaler_path=_scaler_path,
+                 input_dim=_input_dim, poll_interval=10.0):
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.input_dim = input_dim
+        self.poll_interval = poll_interval
+
+        self._model = None
+        self._version = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def current_version(self):
+        """
+        Returns a signature of the model and scaler files on disk, or None
+        if the model file is missing (e.g. mid-deploy).
+        """
+        version = []
+        for path in (self.model_path, self.scaler_path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                if path == self.model_path:
+                    return None
+                version.append(None)
+                continue
+            version.append((st.st_mtime_ns, st.st_size))
+        return tuple(version)
+
+    def _prepare(self, version):
+        """
+        Loads, validates and warms up a model without touching the live one.
+        """
+        # Only the first load may fall back to a legacy model without a scaler
+        model = load_scoring_model(
+            self.model_path, self.scaler_path, require_scaler=self._model is not None
+        )
+        if self.current_version() != version:
+            raise ValueError("Model files changed while loading, waiting for the deploy to finish")
+
+        input_dim = model.input_shape[-1]
+        if input_dim != self.input_dim:
+            raise ValueError(f"Model expects {input_dim} features, expected {self.input_dim}")
+
+        # Trace the predict function for a full batch and a partial one before the
+        # swap, so the first live batch (and its remainder) doesn't retrace
+        warmup = np.zeros((_predict_batch_size + 1, self.input_dim), dtype=np.float32)
+        model.predict(warmup, batch_size=_predict_batch_size, verbose=0)
+        return model
+
+    def reload(self):
+        """
+        Loads the model on disk if it differs from the live one.
+        Returns True if a new model was swapped in.
+        """
+        with self._load_lock:
+            version = self.current_version()
+            if self._model is not None and (version is None or version == self._version):
+                return False
+            try:
+                if version is None:
+                    raise FileNotFoundError(f"Model not found at {self.model_path}")
+                model = self._prepare(version)
+            except Exception as e:
+                if self._model is None:
+                    raise
+                print(f"Model reload failed, keeping current model: {e}")
+                self._version = version  # Don't retry until the files change again
+                return False
+
+            # Atomic swap: in-flight batches keep their reference to the old model
+            self._model = model
+            self._version = version
+            print(f"[{time.ctime()}] Loaded model from {self.model_path}")
+            return True
+
+    def get_model(self):
+        if self._model is None:
+            self.reload()
+        return self._model
+
+    def _watch(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Model watcher error: {e}")
+
+    def start(self):
+        """
+        Starts the background thread that polls the model directory.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def get_model_manager():
+    """
+    Lazily creates the process-wide model manager.
+    """
+    global _manager
+    if _manager is None:
+        _manager = ModelManager()
+    return _manager
+
+def start_model_watcher(poll_interval=10.0):
+    """
+    Loads the model now and keeps it updated from disk in the background.
+    """
+    manager = get_model_manager()
+    manager.poll_interval = poll_interval
+    manager.get_model()
+    manager.start()
+    return manager
 
 def get_model():
     """
-    Lazily loads and caches the model on first use.
+    Returns the currently live model, loading it on first use.
     """
-    global _model
-    if _model is None:
-        _model = keras_load_model(_model_path)
-        _model.trainable = False
-    return _model
+    return get_model_manager().get_model()
 
 def get_anomaly_scores(X: np.ndarray) -> np.ndarray:
+    # Take one reference per batch so a concurrent reload swaps between batches
     model = get_model()
-    preds = model.predict(X, verbose=0)
+    preds = model.predict(X, batch_size=_predict_batch_size, verbose=0)
     return preds
@@ -191,3 +191,163 @@ class KDDFeatureExtractor:
         features = {**rec, **stats}
         features['label'] = ''  # Label placeholder for downstream usage
         return features
+
+
+# Zeek conn_state -> Argus-style state used by UNSW-NB15 (TCP only)
+ZEEK_STATE_TO_UNSW = {
+    'SF': 'FIN',
+    'S0': 'REQ',
+    'S1': 'CON',
+    'S2': 'CON',
+    'S3': 'CON',
+    'SH': 'FIN',
+    'SHR': 'FIN',
+    'REJ': 'RST',
+    'RSTO': 'RST',
+    'RSTR': 'RST',
+    'RSTOS0': 'RST',
+    'RSTRH': 'RST',
+    'OTH': 'CON'
+}
+
+# Columns kept by AnomalyDetection/prep_UNSW.py after dropping
+# srcip, dstip, sport, dsport, Stime, Ltime and attack_cat
+UNSW_COLUMNS = [
+    'proto', 'state', 'dur', 'sbytes', 'dbytes', 'sttl', 'dttl', 'sloss', 'dloss', 'service',
+    'Sload', 'Dload', 'Spkts', 'Dpkts', 'swin', 'dwin', 'stcpb', 'dtcpb', 'smeansz', 'dmeansz',
+    'trans_depth', 'res_bdy_len', 'Sjit', 'Djit', 'Sintpkt', 'Dintpkt', 'tcprtt', 'synack',
+    'ackdat', 'is_sm_ips_ports', 'ct_state_ttl', 'ct_flw_http_mthd', 'is_ftp_login', 'ct_ftp_cmd',
+    'ct_srv_src', 'ct_srv_dst', 'ct_dst_ltm', 'ct_src_ltm', 'ct_src_dport_ltm', 'ct_dst_sport_ltm',
+    'ct_dst_src_ltm', 'label'
+]
+
+# "Last N connections" counters: feature -> record fields that must match
+UNSW_CT_KEYS = {
+    'ct_srv_src': ('service', 'srcip'),
+    'ct_srv_dst': ('service', 'dstip'),
+    'ct_dst_ltm': ('dstip',),
+    'ct_src_ltm': ('srcip',),
+    'ct_src_dport_ltm': ('srcip', 'dsport'),
+    'ct_dst_sport_ltm': ('dstip', 'sport'),
+    'ct_dst_src_ltm': ('srcip', 'dstip'),
+}
+
+
+class UNSWFeatureExtractor:
+    """
+    Converts Zeek connection logs into UNSW-NB15-style features. The ct_*
+    features count matches among the last `window_size` connections, kept as
+    incremental counters over one shared ring buffer instead of rescanning it.
+    As in UNSW-NB15, the window includes the current connection (the current
+    one plus the window_size - 1 before it), so every ct_* value is at least 1.
+    """
+    def __init__(self, window_size=100):
+        self.window_size = window_size
+        # Ring buffer of counter keys for the last window_size connections, current included
+        self.ring = [None] * window_size
+        self.ring_pos = 0
+        self.counters = {name: defaultdict(int) for name in UNSW_CT_KEYS}
+
+    def map_raw(self, raw):
+        """
+        Convert a single Zeek log entry into a basic UNSW-like record.
+        """
+        rec = {}
+
+        # Connection identifiers (used for ct_* counters, dropped from the output)
+        rec['srcip'] = raw.get('id.orig_h')
+        rec['dstip'] = raw.get('id.resp_h')
+        rec['sport'] = raw.get('id.orig_p')
+        rec['dsport'] = raw.get('id.resp_p')
+
+        proto = raw.get('proto', 'tcp').lower()
+        rec['proto'] = proto
+
+        # State: TCP from conn_state, otherwise Argus CON/INT by whether the responder answered
+        spkts = raw.get('orig_pkts', 0) or 0
+        dpkts = raw.get('resp_pkts', 0) or 0
+        if proto == 'tcp':
+            rec['state'] = ZEEK_STATE_TO_UNSW.get(raw.get('conn_state', 'OTH'), 'CON')
+        else:
+            rec['state'] = 'CON' if dpkts else 'INT'
+
+        dur = raw.get('duration', 0.0) or 0.0
+        sbytes = raw.get('orig_ip_bytes', raw.get('orig_bytes', 0)) or 0
+        dbytes = raw.get('resp_ip_bytes', raw.get('resp_bytes', 0)) or 0
+        rec['dur'] = dur
+        rec['sbytes'] = sbytes
+        rec['dbytes'] = dbytes
+
+        # Service: Zeek may report several (e.g. "ssl,http"), UNSW uses '-' for none
+        service = raw.get('service') or '-'
+        rec['service'] = service.split(',')[0]
+
+        # Throughput in bits per second
+        rec['Sload'] = sbytes * 8 / dur if dur else 0.0
+        rec['Dload'] = dbytes * 8 / dur if dur else 0.0
+
+        rec['Spkts'] = spkts
+        rec['Dpkts'] = dpkts
+        rec['smeansz'] = sbytes / spkts if spkts else 0
+        rec['dmeansz'] = dbytes / dpkts if dpkts else 0
+
+        # Mean inter-packet arrival time in milliseconds
+        rec['Sintpkt'] = dur * 1000 / (spkts - 1) if spkts > 1 else 0.0
+        rec['Dintpkt'] = dur * 1000 / (dpkts - 1) if dpkts > 1 else 0.0
+
+        rec['is_sm_ips_ports'] = int(rec['srcip'] == rec['dstip'] and rec['sport'] == rec['dsport'])
+
+        # Placeholder fields (not available in conn.log)
+        for field in [
+            'sttl', 'dttl', 'sloss', 'dloss', 'swin', 'dwin', 'stcpb', 'dtcpb',
+            'trans_depth', 'res_bdy_len', 'Sjit', 'Djit', 'tcprtt', 'synack', 'ackdat',
+            'ct_state_ttl', 'ct_flw_http_mthd', 'is_ftp_login', 'ct_ftp_cmd'
+        ]:
+            rec[field] = raw.get(field, 0)
+
+        return rec
+
+    def compute_window_stats(self, rec):
+        """
+        Adds the current record to the window, then looks up its ct_* counts.
+        """
+        keys = tuple(
+            tuple(rec[field] for field in fields) for fields in UNSW_CT_KEYS.values()
+        )
+        self.update_window(keys)
+
+        return {
+            name: counter[key]
+            for (name, counter), key in zip(self.counters.items(), keys)
+        }
+
+    def update_window(self, keys):
+        """
+        Adds a record's keys to the ring buffer, evicting the oldest record's
+        keys from the counters once the window is full.
+        """
+        evicted = self.ring[self.ring_pos]
+        if evicted is not None:
+            for counter, key in zip(self.counters.values(), evicted):
+                if counter[key] == 1:
+                    del counter[key]  # Keep the maps bounded by the window size
+                else:
+                    counter[key] -= 1
+
+        for counter, key in zip(self.counters.values(), keys):
+            counter[key] += 1
+
+        self.ring[self.ring_pos] = keys
+        self.ring_pos = (self.ring_pos + 1) % self.window_size
+
+    def extract_features(self, raw):
+        """
+        Converts a raw Zeek connection record into a UNSW feature vector
+        with the columns kept by prep_UNSW.py.
+        """
+        rec = self.map_raw(raw)
+        stats = self.compute_window_stats(rec)
+
+        features = {**rec, **stats}
+        features['label'] = 0  # Label placeholder for downstream usage
+        return {col: features[col] for col in UNSW_COLUMNS}